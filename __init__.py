@@ -6,8 +6,11 @@ from .rate_limiter import (
     RateLimiter,
     InMemoryRateLimiter,
     RedisRateLimiter,
+    AsyncRedisRateLimiter,
+    SlidingWindowRedisRateLimiter,
     TokenBucketRateLimiter,
     FixedWindowRateLimiter,
+    CInMemoryRateLimiter,
     rate_limit,
 )
 
@@ -16,7 +19,10 @@ __all__ = [
     "RateLimiter",
     "InMemoryRateLimiter",
     "RedisRateLimiter",
+    "AsyncRedisRateLimiter",
+    "SlidingWindowRedisRateLimiter",
     "TokenBucketRateLimiter",
     "FixedWindowRateLimiter",
+    "CInMemoryRateLimiter",
     "rate_limit",
 ]
@@ -1,20 +1,66 @@
-from abc import ABC, abstractmethod
 from fastapi import Request, HTTPException
-from typing import Dict, Tuple, Callable, Optional, Any
+from typing import Dict, Hashable, Tuple, Callable, Optional, Any
+import asyncio
+import heapq
+import inspect
+import logging
+import random
+import sys
+import threading
 import time
+from collections import OrderedDict, deque
 from functools import wraps
 
+try:
+    # Compiled fast path built from _ratelimit.pyx when Cython is available
+    from ._ratelimit import CInMemoryRateLimiter
+except ImportError:
+    CInMemoryRateLimiter = None
+
+logger = logging.getLogger(__name__)
+
+# time.time() costs a clock read plus a PyFloat allocation on every call,
+# and sub-millisecond precision is irrelevant for whole-second windows.
+# Cache the wall-clock value and refresh it off the cheaper monotonic
+# clock at most every 50 ms.
+_NOW_REFRESH_SECONDS = 0.05
+_now_cache = [0.0, 0.0]  # [monotonic stamp, cached wall-clock time]
+
+
+def _now() -> float:
+    """Wall-clock time, cached for up to 50 ms between refreshes"""
+    mono = time.monotonic()
+    if mono - _now_cache[0] > _NOW_REFRESH_SECONDS:
+        _now_cache[0] = mono
+        _now_cache[1] = time.time()
+    return _now_cache[1]
+
+
+# Process-local limiters track windows in integer monotonic nanoseconds:
+# integer compares skip PyFloat allocation per branch and the clock is
+# immune to NTP jumps. Redis-backed limiters must keep wall-clock time,
+# since their timestamps are shared across processes.
+_NS_PER_SECOND = 1_000_000_000
+
+
+class RateLimiter:
+    """Base class describing the limiter interface.
+
+    Deliberately not an ABC: abc registration adds C-level subclass-hook
+    machinery to what is a pure duck-typed protocol, and every concrete
+    limiter defines __slots__ to drop the per-instance __dict__.
+    """
+
+    __slots__ = ()
 
-class RateLimiter(ABC):
-    @abstractmethod
     def check_rate_limit(
-        self, identifier: str, requests_limit: int, window_seconds: int
+        self, identifier: Hashable, requests_limit: int, window_seconds: int
     ) -> Tuple[bool, int]:
         """
         Check if the rate limit has been exceeded.
 
         Args:
-            identifier: The unique identifier for the client
+            identifier: The unique, hashable identifier for the client
             requests_limit: Maximum number of requests allowed in the window
             window_seconds: Time window in seconds
 
@@ -23,7 +69,25 @@ class RateLimiter(ABC):
             - is_allowed: True if request is allowed, False if rate limit exceeded
             - retry_after_seconds: Seconds to wait before retry if rate limit exceeded, 0 otherwise
         """
-        pass
+        raise NotImplementedError
+
+    def check_rate_limit_batch(
+        self, identifiers: list, limits: list, windows: list
+    ) -> list:
+        """
+        Check several (identifier, limit, window) rules in one call.
+
+        Backends override this to amortize per-call overhead - one lock
+        acquisition or one Redis round-trip for the whole batch. The
+        default just loops over check_rate_limit.
+
+        Returns:
+            List of (is_allowed, retry_after_seconds) tuples, one per rule
+        """
+        return [
+            self.check_rate_limit(identifier, limit, window)
+            for identifier, limit, window in zip(identifiers, limits, windows)
+        ]
 
     def get_data(self, key: str) -> Any:
         """
@@ -50,101 +114,484 @@ class RateLimiter(ABC):
 
 
 class InMemoryRateLimiter(RateLimiter):
-    def __init__(self):
-        self.request_records: Dict[str, Tuple[int, float]] = {}
-        self.data_store = {}
+    # Records are striped across this many (lock, dict) shards so that
+    # concurrent requests only contend when their identifiers hash to the
+    # same shard, instead of serializing on one global lock.
+    NUM_SHARDS = 64
 
-    def check_rate_limit(
-        self, identifier: str, requests_limit: int, window_seconds: int
+    # Default cap on tracked identifiers. One record per (IP + path) with
+    # no bound is an easy memory leak under a wide crawler or DDoS.
+    DEFAULT_MAX_ENTRIES = 100_000
+
+    __slots__ = ("max_entries", "_shard_cap", "_shards", "data_store", "_expiry_heap")
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            max_entries: Maximum identifiers tracked at once; the least
+                recently seen are evicted beyond this
+        """
+        self.max_entries = max_entries
+        self._shard_cap = max(1, max_entries // self.NUM_SHARDS)
+        self._shards: list[Tuple[threading.Lock, "OrderedDict[str, Tuple[int, int]]"]] = [
+            (threading.Lock(), OrderedDict()) for _ in range(self.NUM_SHARDS)
+        ]
+        self.data_store: Dict[str, Tuple[Any, float]] = {}  # key -> (value, expiry)
+        self._expiry_heap: list = []  # (expiry, key), swept lazily on access
+
+    def _shard(self, identifier: Hashable) -> Tuple[threading.Lock, "OrderedDict[str, Tuple[int, int]]"]:
+        """Pick the (lock, records) shard an identifier belongs to"""
+        return self._shards[hash(identifier) & (self.NUM_SHARDS - 1)]
+
+    def _check_in_shard(
+        self, records, identifier: Hashable, requests_limit: int, window_ns: int, current_time: int
     ) -> Tuple[bool, int]:
-        current_time = time.time()
+        """Run the window check against a shard dict; caller holds its lock"""
+        record = records.get(identifier)
 
-        if identifier in self.request_records:
-            requests_count, window_start = self.request_records[identifier]
+        if record is not None:
+            records.move_to_end(identifier)
+            requests_count, window_start = record
 
-            if current_time - window_start > window_seconds:
-                self.request_records[identifier] = (1, current_time)
+            if current_time - window_start > window_ns:
+                records[identifier] = (1, current_time)
                 return True, 0
             elif requests_count >= requests_limit:
-                retry_after = int(window_start + window_seconds - current_time)
+                retry_after = (window_start + window_ns - current_time) // _NS_PER_SECOND
                 return False, retry_after
             else:
-                self.request_records[identifier] = (requests_count + 1, window_start)
+                records[identifier] = (requests_count + 1, window_start)
                 return True, 0
-        else:
-            self.request_records[identifier] = (1, current_time)
-            return True, 0
 
-    def get_data(self, key: str) -> Any:
-        """Get data from the in-memory data store"""
-        return self.data_store.get(key)
+        records[identifier] = (1, current_time)
+        if len(records) > self._shard_cap:
+            records.popitem(last=False)  # evict the least recently seen
+        return True, 0
 
-    def set_data(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
-        """Set data in the in-memory data store"""
-        self.data_store[key] = value, ttl
+    def check_rate_limit(
+        self, identifier: Hashable, requests_limit: int, window_seconds: int
+    ) -> Tuple[bool, int]:
+        current_time = time.monotonic_ns()
+        lock, records = self._shard(identifier)
+
+        with lock:
+            return self._check_in_shard(
+                records, identifier, requests_limit, window_seconds * _NS_PER_SECOND, current_time
+            )
+
+    def check_rate_limit_batch(
+        self, identifiers: list, limits: list, windows: list
+    ) -> list:
+        """Check several rules with one lock acquisition per touched shard"""
+        current_time = time.monotonic_ns()
+        results: list = [None] * len(identifiers)
+
+        by_shard: Dict[int, list] = {}
+        for i, identifier in enumerate(identifiers):
+            by_shard.setdefault(hash(identifier) & (self.NUM_SHARDS - 1), []).append(i)
+
+        for shard_index, indices in by_shard.items():
+            lock, records = self._shards[shard_index]
+            with lock:
+                for i in indices:
+                    results[i] = self._check_in_shard(
+                        records,
+                        identifiers[i],
+                        limits[i],
+                        windows[i] * _NS_PER_SECOND,
+                        current_time,
+                    )
+        return results
+
+    def sweep_expired(self, max_window_seconds: int) -> int:
+        """Bulk-drop records whose window ended over max_window_seconds ago.
+
+        Companion to the LRU cap: an occasional sweep (e.g. from a
+        periodic task) reclaims records of one-off identifiers without
+        waiting for cap pressure. One pass per shard, scanning records in
+        a single C-level comprehension rather than per-request checks.
+
+        Returns:
+            Number of records dropped
+        """
+        cutoff = time.monotonic_ns() - max_window_seconds * _NS_PER_SECOND
+        dropped = 0
+        for lock, records in self._shards:
+            with lock:
+                expired = [
+                    identifier
+                    for identifier, (_, window_start) in records.items()
+                    if window_start <= cutoff
+                ]
+                for identifier in expired:
+                    del records[identifier]
+                dropped += len(expired)
+        return dropped
+
+    def _sweep_expired(self, now: float) -> None:
+        """Drop expired entries from the top of the expiry heap"""
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expiry, key = heapq.heappop(self._expiry_heap)
+            entry = self.data_store.get(key)
+            # Only delete if the key wasn't overwritten with a later expiry
+            if entry is not None and entry[1] <= now:
+                del self.data_store[key]
+
+    def get_data(self, key: str) -> Any:
+        """Get data from the in-memory data store, honoring TTLs"""
+        now = _now()
+        self._sweep_expired(now)
+        entry = self.data_store.get(key)
+        if entry is None or entry[1] <= now:
+            return None
+        return entry[0]
+
+    def set_data(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        """Set data in the in-memory data store with an optional TTL"""
+        expiry = _now() + ttl if ttl else float("inf")
+        self.data_store[key] = (value, expiry)
+        if ttl:
+            heapq.heappush(self._expiry_heap, (expiry, key))
 
 
 class RedisRateLimiter(RateLimiter):
-    def __init__(self, redis_client, prefix="ratelimit:"):
+    # Atomic fixed-window check. Runs server-side so the read, the expiry
+    # decision and the write happen in a single round-trip with no
+    # check-then-act race between concurrent clients. State lives in a
+    # single hash per identifier ("c" = count, "s" = window start), so a
+    # reset is one HSET + EXPIRE and an increment is one HINCRBY.
+    # KEYS = [key], ARGV = [now, window_seconds, requests_limit]
+    # Returns {allowed, retry_after, count, window_start} so callers in
+    # batching mode get a state snapshot for free with every script run.
+    CHECK_SCRIPT = """
+    local state = redis.call('HMGET', KEYS[1], 'c', 's')
+    local now = tonumber(ARGV[1])
+    local window = tonumber(ARGV[2])
+    local limit = tonumber(ARGV[3])
+    if not state[1] or not state[2] or now - tonumber(state[2]) > window then
+        redis.call('HSET', KEYS[1], 'c', 1, 's', now)
+        redis.call('EXPIRE', KEYS[1], window)
+        return {1, 0, 1, now}
+    elseif tonumber(state[1]) >= limit then
+        return {0, math.ceil(tonumber(state[2]) + window - now), tonumber(state[1]), tonumber(state[2])}
+    else
+        local count = redis.call('HINCRBY', KEYS[1], 'c', 1)
+        return {1, 0, count, tonumber(state[2])}
+    end
+    """
+
+    __slots__ = (
+        "redis",
+        "prefix",
+        "batch_window",
+        "_batch_lock",
+        "_pending",
+        "_snapshots",
+        "_flush_thread",
+        "_check_sha",
+    )
+
+    def __init__(self, redis_client, prefix="ratelimit:", batch_window: Optional[float] = None):
         """
         Args:
             redis_client: An initialized redis client
             prefix: Prefix for redis keys
+            batch_window: When set, allowed requests are counted locally
+                and flushed to Redis every batch_window seconds instead of
+                costing one round-trip each. Limiting becomes approximate
+                across processes by up to one batch of requests.
         """
         self.redis = redis_client
         self.prefix = prefix
+        self.batch_window = batch_window
+        self._batch_lock = threading.Lock()
+        self._pending: Dict[str, list] = {}  # key -> [delta, window_seconds, window_start]
+        self._snapshots: Dict[str, list] = {}  # key -> [count, window_start, fetched_at]
+        self._flush_thread = None
+        self._check_sha = self.redis.script_load(self.CHECK_SCRIPT)
 
     def check_rate_limit(
-        self, identifier: str, requests_limit: int, window_seconds: int
+        self, identifier: Hashable, requests_limit: int, window_seconds: int
     ) -> Tuple[bool, int]:
         key = f"{self.prefix}{identifier}"
-
-        pipe = self.redis.pipeline()
-        pipe.get(f"{key}:count")
-        pipe.get(f"{key}:start")
-        count_bytes, start_bytes = pipe.execute()
-
-        current_time = time.time()
-
-        if count_bytes and start_bytes:
-            count = int(count_bytes)
-            start = float(start_bytes)
-
-            if current_time - start > window_seconds:
-                # Window expired, reset counter
-                pipe = self.redis.pipeline()
-                pipe.set(f"{key}:count", 1)
-                pipe.set(f"{key}:start", current_time)
-                pipe.expire(f"{key}:count", window_seconds)
-                pipe.expire(f"{key}:start", window_seconds)
-                pipe.execute()
-                return True, 0
-            elif count >= requests_limit:
-                retry_after = int(start + window_seconds - current_time)
-                return False, retry_after
+        now = _now()
+
+        if self.batch_window:
+            allowed = self._check_batched(key, requests_limit, window_seconds, now)
+            if allowed is not None:
+                return allowed
+
+        result = self.redis.evalsha(
+            self._check_sha,
+            1,
+            key,
+            now,
+            window_seconds,
+            requests_limit,
+        )
+        if self.batch_window:
+            with self._batch_lock:
+                self._snapshots[key] = [int(result[2]), float(result[3]), now]
+        return bool(result[0]), int(result[1])
+
+    def check_rate_limit_batch(
+        self, identifiers: list, limits: list, windows: list
+    ) -> list:
+        """Check several rules in pipelined round-trips, one per chunk"""
+        now = _now()
+        commands = [
+            (
+                lambda p, k=f"{self.prefix}{identifier}", w=window, l=limit: p.evalsha(
+                    self._check_sha, 1, k, now, w, l
+                )
+            )
+            for identifier, limit, window in zip(identifiers, limits, windows)
+        ]
+        return [(bool(result[0]), int(result[1])) for result in self._exec_chunked(commands)]
+
+    def _check_batched(
+        self, key: str, requests_limit: int, window_seconds: int, now: float
+    ) -> Optional[Tuple[bool, int]]:
+        """Try to answer from the local snapshot without a Redis call.
+
+        Returns None when the snapshot is missing, stale or too close to
+        the limit to decide safely; the caller then falls back to the
+        atomic script, which refreshes the snapshot as a side effect.
+        """
+        with self._batch_lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is None:
+                return None
+            count, window_start, fetched_at = snapshot
+            if now - fetched_at > self.batch_window or now - window_start > window_seconds:
+                del self._snapshots[key]
+                return None
+            if count + 1 >= requests_limit:
+                return None
+
+            snapshot[0] = count + 1
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = [1, window_seconds, window_start]
             else:
-                self.redis.incr(f"{key}:count")
-                return True, 0
+                pending[0] += 1
+            self._ensure_flusher()
+            return True, 0
 
-        # First request
-        pipe = self.redis.pipeline()
-        pipe.set(f"{key}:count", 1)
-        pipe.set(f"{key}:start", current_time)
-        pipe.expire(f"{key}:count", window_seconds)
-        pipe.expire(f"{key}:start", window_seconds)
-        pipe.execute()
-        return True, 0
+    def _ensure_flusher(self) -> None:
+        """Start the background flush thread on first batched hit"""
+        if self._flush_thread is None:
+            self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flush_thread.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            time.sleep(self.batch_window)
+            self.flush()
+
+    # Commands per pipeline when flushing. One unbounded pipeline over
+    # thousands of identifiers balloons the server's response buffers, so
+    # bulk writes are split into fixed-size batches instead.
+    MAX_PIPELINE = 1000
+
+    def _exec_chunked(self, commands: list, chunk: int = MAX_PIPELINE) -> list:
+        """Run a list of pipeline-callable ops in bounded-size pipelines"""
+        results: list = []
+        for i in range(0, len(commands), chunk):
+            pipe = self.redis.pipeline()
+            for op in commands[i : i + chunk]:
+                op(pipe)
+            results.extend(pipe.execute())
+        return results
+
+    def flush(self) -> None:
+        """Push locally accumulated increments to Redis in bounded pipelines"""
+        with self._batch_lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        commands = []
+        for key, (delta, window_seconds, window_start) in pending.items():
+            commands.append(lambda p, k=key, d=delta: p.hincrby(k, "c", d))
+            commands.append(lambda p, k=key, s=window_start: p.hsetnx(k, "s", s))
+            commands.append(lambda p, k=key, w=window_seconds: p.expire(k, w))
+        try:
+            self._exec_chunked(commands)
+        except Exception:
+            # Transient Redis failure: keep the increments for the next
+            # flush rather than silently dropping them. Chunks already
+            # written get re-applied, but over-counting is the safe
+            # direction for a limiter.
+            logger.exception("rate-limit flush to Redis failed; retrying next cycle")
+            with self._batch_lock:
+                for key, entry in pending.items():
+                    current = self._pending.get(key)
+                    if current is None:
+                        self._pending[key] = entry
+                    else:
+                        current[0] += entry[0]
 
     def get_data(self, key: str) -> Any:
         """Get data from Redis"""
-        self.redis.get(key)
+        return self.redis.get(key)
+
+    def get_many(self, keys: list) -> list:
+        """Get several keys in one MGET round-trip"""
+        return self.redis.mget(keys)
 
     def set_data(self, key: str, value: Any, ttl: Optional[int]):
         """Set data in Redis w/optional ttl"""
         self.redis.setex(key, ttl, value) if ttl else self.redis.set(key, value)
 
 
+class AsyncRedisRateLimiter(RateLimiter):
+    """Fixed-window limiter for redis.asyncio clients with auto-pipelining.
+
+    Concurrent checks from the same event-loop tick are accumulated and
+    flushed as one pipeline, so overlapping in-flight requests share a
+    round-trip. A lone check skips the pipeline machinery entirely, so
+    there is no batching overhead under low load.
+    """
+
+    CHECK_SCRIPT = RedisRateLimiter.CHECK_SCRIPT
+
+    __slots__ = ("redis", "prefix", "_check_sha", "_pending", "_flush_scheduled", "_flush_task")
+
+    def __init__(self, redis_client, prefix="ratelimit:"):
+        """
+        Args:
+            redis_client: An initialized redis.asyncio client
+            prefix: Prefix for redis keys
+        """
+        self.redis = redis_client
+        self.prefix = prefix
+        self._check_sha = None
+        self._pending: deque = deque()  # (evalsha args, future)
+        self._flush_scheduled = False
+        self._flush_task = None
+
+    async def check_rate_limit(
+        self, identifier: Hashable, requests_limit: int, window_seconds: int
+    ) -> Tuple[bool, int]:
+        if self._check_sha is None:
+            self._check_sha = await self.redis.script_load(self.CHECK_SCRIPT)
+
+        args = (1, f"{self.prefix}{identifier}", _now(), window_seconds, requests_limit)
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((args, future))
+
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            # Flush from a detached task, not this coroutine: request
+            # handlers get cancelled on client disconnect, and a cancelled
+            # flusher would strand every queued future
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_soon())
+
+        result = await future
+        return bool(result[0]), int(result[1])
+
+    async def _flush_soon(self) -> None:
+        try:
+            # Yield once so other checks started this tick can join the batch
+            await asyncio.sleep(0)
+        finally:
+            await self._flush_pending()
+
+    async def _flush_pending(self) -> None:
+        pending = list(self._pending)
+        self._pending.clear()
+        self._flush_scheduled = False
+        if not pending:
+            return
+
+        if len(pending) == 1:
+            # Low load: a direct call beats pipeline bookkeeping
+            args, future = pending[0]
+            try:
+                result = await self.redis.evalsha(self._check_sha, *args)
+            except Exception as exc:
+                if not future.done():
+                    future.set_exception(exc)
+                return
+            if not future.done():
+                future.set_result(result)
+            return
+
+        pipe = self.redis.pipeline()
+        for args, _ in pending:
+            pipe.evalsha(self._check_sha, *args)
+        try:
+            results = await pipe.execute()
+        except Exception as exc:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(pending, results):
+            # A caller cancelled mid-flight leaves its future already done
+            if not future.done():
+                future.set_result(result)
+
+
+class SlidingWindowRedisRateLimiter(RateLimiter):
+    # Atomic sliding-window check over a sorted set of request timestamps.
+    # Expired entries are trimmed, the remaining cardinality is compared to
+    # the limit, and the new request is recorded - all in one round-trip.
+    # Unlike the fixed window this has no boundary-burst problem: a client
+    # can never exceed the limit in any window_seconds-long interval.
+    # KEYS = [key], ARGV = [now, window_seconds, requests_limit, member_suffix]
+    CHECK_SCRIPT = """
+    local now = tonumber(ARGV[1])
+    local window = tonumber(ARGV[2])
+    local limit = tonumber(ARGV[3])
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+    local count = redis.call('ZCARD', KEYS[1])
+    if count < limit then
+        redis.call('ZADD', KEYS[1], now, ARGV[1] .. ':' .. ARGV[4])
+        redis.call('EXPIRE', KEYS[1], window)
+        return {1, 0}
+    else
+        local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+        return {0, math.ceil(tonumber(oldest[2]) + window - now)}
+    end
+    """
+
+    __slots__ = ("redis", "prefix", "_check_sha", "_sequence")
+
+    def __init__(self, redis_client, prefix="ratelimit:sliding:"):
+        """
+        Args:
+            redis_client: An initialized redis client
+            prefix: Prefix for redis keys
+        """
+        self.redis = redis_client
+        self.prefix = prefix
+        self._check_sha = self.redis.script_load(self.CHECK_SCRIPT)
+        self._sequence = 0
+
+    def check_rate_limit(
+        self, identifier: Hashable, requests_limit: int, window_seconds: int
+    ) -> Tuple[bool, int]:
+        key = f"{self.prefix}{identifier}"
+
+        # Suffix makes members unique even when two requests share a timestamp
+        self._sequence = (self._sequence + 1) & 0xFFFF
+        is_allowed, retry_after = self.redis.evalsha(
+            self._check_sha,
+            1,
+            key,
+            _now(),
+            window_seconds,
+            requests_limit,
+            self._sequence,
+        )
+        return bool(is_allowed), int(retry_after)
+
+
 class TokenBucketRateLimiter(RateLimiter):
+    __slots__ = ("storage", "bucket_capacity", "_cfg_cache", "_get_bucket_data", "_set_bucket_data")
+
     def __init__(
         self,
         storage_backend: Optional[RateLimiter] = None,
@@ -160,17 +607,16 @@ class TokenBucketRateLimiter(RateLimiter):
         """
         self.storage = storage_backend or InMemoryRateLimiter()
         self.bucket_capacity = bucket_capacity
-
-    def _get_bucket_data(self, key: str) -> Optional[Any]:
-        """Get data from the underlying storage"""
-        return self.storage.get_data(key)
-
-    def _set_bucket_data(self, key: str, value: Any, ttl: Optional[int]) -> None:
-        """Set data in the underlying storage"""
-        self.storage.set_data(key, value, ttl)
+        # Derived (refill_rate, capacity) per (limit, window) pair, so the
+        # hot path never redoes the division
+        self._cfg_cache: Dict[Tuple[int, int], Tuple[float, float]] = {}
+        # Bound methods captured once; the hot path skips two attribute
+        # lookups and an extra call frame per storage access
+        self._get_bucket_data = self.storage.get_data
+        self._set_bucket_data = self.storage.set_data
 
     def check_rate_limit(
-        self, identifier: str, requests_limit: int, window_seconds: int
+        self, identifier: Hashable, requests_limit: int, window_seconds: int
     ) -> Tuple[bool, int]:
         """
         Check if a request is allowed by the token bucket algorithm.
@@ -183,26 +629,32 @@ class TokenBucketRateLimiter(RateLimiter):
         Returns:
             Tuple of (is_allowed, retry_after_seconds)
         """
-        refill_rate = requests_limit / window_seconds
-        bucket_capacity = self.bucket_capacity or requests_limit
+        config = self._cfg_cache.get((requests_limit, window_seconds))
+        if config is None:
+            config = self._cfg_cache[(requests_limit, window_seconds)] = (
+                requests_limit / window_seconds,
+                self.bucket_capacity or requests_limit,
+            )
+        refill_rate, bucket_capacity = config
 
+        # Token count and last update travel together in one value
+        # ("tokens:last_update"), so bucket state costs one storage
+        # round-trip to read and one to write instead of two of each
         bucket_key = f"bucket:{identifier}"
-        last_update_key = f"last_update:{identifier}"
-
-        current_tokens = self._get_bucket_data(bucket_key)
-        last_update = self._get_bucket_data(last_update_key)
-
-        current_time = time.time()
+        state = self._get_bucket_data(bucket_key)
+        current_time = _now()
 
-        if current_tokens is None or last_update is None:
-            self._set_bucket_data(bucket_key, bucket_capacity - 1, window_seconds * 2)
-            self._set_bucket_data(last_update_key, current_time, window_seconds * 2)
+        if state is None:
+            self._set_bucket_data(
+                bucket_key, f"{bucket_capacity - 1}:{current_time}", window_seconds * 2
+            )
             return True, 0
 
-        if isinstance(current_tokens, str):
-            current_tokens = float(current_tokens)
-        if isinstance(last_update, str):
-            last_update = float(last_update)
+        if isinstance(state, bytes):
+            state = state.decode()
+        tokens_raw, _, last_update_raw = state.partition(":")
+        current_tokens = float(tokens_raw)
+        last_update = float(last_update_raw)
 
         time_elapsed = current_time - last_update
         tokens_to_add = time_elapsed * refill_rate
@@ -210,17 +662,22 @@ class TokenBucketRateLimiter(RateLimiter):
 
         if new_token_count >= 1:
             new_token_count -= 1
-            self._set_bucket_data(bucket_key, new_token_count, window_seconds * 2)
-            self._set_bucket_data(last_update_key, current_time, window_seconds * 2)
+            self._set_bucket_data(
+                bucket_key, f"{new_token_count}:{current_time}", window_seconds * 2
+            )
             return True, 0
 
         time_until_next_token = (1 - new_token_count) / refill_rate
         retry_after = int(time_until_next_token + 0.5)
-        self._set_bucket_data(last_update_key, current_time, window_seconds * 2)
+        self._set_bucket_data(bucket_key, f"{current_tokens}:{current_time}", window_seconds * 2)
         return False, max(1, retry_after)
 
 
 class FixedWindowRateLimiter(RateLimiter):
+    JITTER_POOL_SIZE = 1024
+
+    __slots__ = ("storage", "jitter_seconds", "_jitter_pool", "_jitter_index")
+
     def __init__(self, storage_backend: RateLimiter, jitter_seconds: int = 0):
         """
         Implements fixed window rate limiting with optional jitter
@@ -231,22 +688,114 @@ class FixedWindowRateLimiter(RateLimiter):
         """
         self.storage = storage_backend
         self.jitter_seconds = jitter_seconds
+        # Precomputed jitter values; the hot path just cycles through them
+        # instead of paying a Mersenne Twister call per request
+        self._jitter_pool = (
+            [random.randint(0, jitter_seconds) for _ in range(self.JITTER_POOL_SIZE)]
+            if jitter_seconds > 0
+            else None
+        )
+        self._jitter_index = 0
 
     def check_rate_limit(
-        self, identifier: str, requests_limit: int, window_seconds: int
+        self, identifier: Hashable, requests_limit: int, window_seconds: int
     ) -> Tuple[bool, int]:
-        if self.jitter_seconds > 0:
-            import random
-
-            window_seconds += random.randint(0, self.jitter_seconds)
+        if self._jitter_pool is not None:
+            window_seconds += self._jitter_pool[self._jitter_index & (self.JITTER_POOL_SIZE - 1)]
+            self._jitter_index += 1
 
         return self.storage.check_rate_limit(identifier, requests_limit, window_seconds)
 
 
+# Interned copies of client hosts seen so far. The set of distinct hosts
+# is tiny compared to the request volume, so interning pays for itself.
+_host_intern: Dict[str, str] = {}
+
+
+def _default_identifier(request: Request) -> Tuple[str, str]:
+    """Default identifier: (client host, URL path) as interned strings.
+
+    Returning a tuple of interned strings instead of concatenating
+    host + path skips a string allocation per request, and the interned
+    parts carry cached hashes, so dict lookups on the identifier don't
+    rehash the full text every time.
+    """
+    host = request.client.host
+    interned_host = _host_intern.get(host)
+    if interned_host is None:
+        interned_host = _host_intern[host] = sys.intern(host)
+    return (interned_host, sys.intern(request.url.path))
+
+
+def _build_fast_wrapper(func, identifier_func, rate_limiter, requests_limit, window_seconds):
+    """Generate a wrapper specialized to func's request parameter.
+
+    Locating the Request argument once at decoration time replaces the
+    per-call isinstance scan over args/kwargs with a direct index or
+    keyword lookup, and bakes the limits into the generated bytecode as
+    constants. Returns None when the parameter can't be identified, in
+    which case the caller falls back to the generic scanning wrapper.
+    """
+    try:
+        params = list(inspect.signature(func).parameters.values())
+    except (TypeError, ValueError):
+        return None
+
+    def _find(match):
+        for i, param in enumerate(params):
+            if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+                continue
+            if match(param):
+                return i if param.kind is not param.KEYWORD_ONLY else None, param.name
+        return None, None
+
+    # Prefer an explicit Request annotation anywhere in the signature; only
+    # fall back to the name heuristic when nothing is annotated, so a plain
+    # parameter that happens to be called "request" can't shadow the real one
+    index, name = _find(lambda param: param.annotation is Request)
+    if name is None:
+        index, name = _find(lambda param: param.name == "request")
+    if name is None:
+        return None
+
+    if index is None:
+        lookup = f"kwargs.get({name!r})"
+    else:
+        lookup = f"args[{index}] if len(args) > {index} else kwargs.get({name!r})"
+
+    source = f'''
+async def wrapper(*args, **kwargs):
+    request = {lookup}
+    if request is None:
+        raise ValueError("No FastAPI Request object found in arguments")
+
+    is_allowed, retry_after = check_rate_limit(
+        identifier_func(request), {requests_limit}, {window_seconds}
+    )
+
+    if not is_allowed:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit exceeded. Try again in {{retry_after}} seconds.",
+            headers={{"Retry-After": str(retry_after)}},
+        )
+
+    return await func(*args, **kwargs)
+'''
+    namespace = {
+        "check_rate_limit": rate_limiter.check_rate_limit,
+        "identifier_func": identifier_func,
+        "func": func,
+        "HTTPException": HTTPException,
+    }
+    exec(source, namespace)
+    return wraps(func)(namespace["wrapper"])
+
+
 def rate_limit(
     requests_limit: int,
     window_seconds: int,
-    identifier_func: Optional[Callable[[Request], str]] = None,
+    identifier_func: Optional[Callable[[Request], Hashable]] = None,
     rate_limiter: RateLimiter | None = None,
 ):
     """
@@ -259,13 +808,19 @@ def rate_limit(
         rate_limiter: Rate limiter implementation to use (defaults to InMemoryRateLimiter)
     """
     if identifier_func is None:
-        # defaults to client's ip + url path
-        identifier_func = lambda request: request.client.host + request.url.path
+        # defaults to (client's ip, url path) as interned strings
+        identifier_func = _default_identifier
 
     if rate_limiter is None:
         rate_limiter = InMemoryRateLimiter()
 
     def decorator(func):
+        fast_wrapper = _build_fast_wrapper(
+            func, identifier_func, rate_limiter, requests_limit, window_seconds
+        )
+        if fast_wrapper is not None:
+            return fast_wrapper
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
             request = None
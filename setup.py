@@ -1,5 +1,13 @@
 import setuptools
 
+try:
+    # Optional compiled fast path; the pure-Python limiters work without it
+    from Cython.Build import cythonize
+
+    ext_modules = cythonize(["_ratelimit.pyx"])
+except ImportError:
+    ext_modules = []
+
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
 
@@ -23,6 +31,7 @@ setuptools.setup(
         "Operating System :: OS Independent",
         "Framework :: FastAPI",
     ],
+    ext_modules=ext_modules,
     python_requires=">=3.7",
     install_requires=[
         "fastapi>=0.68.0",
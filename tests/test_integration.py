@@ -90,6 +90,34 @@ class TestRateLimitDecorator:
         await test_endpoint("test", request=mock_request)
         limiter.check_rate_limit.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_annotated_request_not_first_argument(self, mock_request):
+        limiter = MagicMock()
+        limiter.check_rate_limit.return_value = (True, 0)
+
+        @rate_limit(5, 60, rate_limiter=limiter)
+        async def test_endpoint(other_arg, req: Request):
+            return {"message": "success"}
+
+        # The specialized wrapper resolves the annotated parameter by position
+        result = await test_endpoint("test", mock_request)
+        assert result == {"message": "success"}
+        limiter.check_rate_limit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_annotated_parameter_beats_request_name(self, mock_request):
+        limiter = MagicMock()
+        limiter.check_rate_limit.return_value = (True, 0)
+
+        @rate_limit(5, 60, rate_limiter=limiter)
+        async def test_endpoint(request: str, real: Request):
+            # "request" is a plain string here; "real" is the actual Request
+            return {"message": "success"}
+
+        result = await test_endpoint("not-a-request", mock_request)
+        assert result == {"message": "success"}
+        limiter.check_rate_limit.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_no_request_raises_error(self):
         @rate_limit(5, 60)
@@ -102,6 +130,18 @@ class TestRateLimitDecorator:
         assert "No FastAPI Request object found" in str(excinfo.value)
 
 
+def test_default_identifier_is_interned_tuple(mock_request):
+    from fast_limiter.rate_limiter import _default_identifier
+
+    id_first = _default_identifier(mock_request)
+    id_second = _default_identifier(mock_request)
+
+    assert id_first == ("127.0.0.1", "/test")
+    assert id_first == id_second
+    # Host strings are interned, so repeated requests share the object
+    assert id_first[0] is id_second[0]
+
+
 # ----------------------
 # Test with real FastAPI application
 # ----------------------
@@ -1,14 +1,23 @@
 import time
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+
 from fast_limiter import (
     InMemoryRateLimiter,
     RedisRateLimiter,
+    AsyncRedisRateLimiter,
+    SlidingWindowRedisRateLimiter,
     TokenBucketRateLimiter,
     FixedWindowRateLimiter,
 )
 
 
+def _records(limiter, identifier):
+    """Shortcut to the shard dict holding an identifier's record"""
+    return limiter._shard(identifier)[1]
+
+
 class TestInMemoryRateLimiter:
     def test_first_request_allowed(self):
         limiter = InMemoryRateLimiter()
@@ -16,7 +25,7 @@ class TestInMemoryRateLimiter:
 
         assert is_allowed is True
         assert retry_after == 0
-        assert limiter.request_records["test_client"][0] == 1  # count
+        assert _records(limiter, "test_client")["test_client"][0] == 1  # count
 
     def test_under_limit_allowed(self):
         limiter = InMemoryRateLimiter()
@@ -28,13 +37,13 @@ class TestInMemoryRateLimiter:
 
         assert is_allowed is True
         assert retry_after == 0
-        assert limiter.request_records["test_client"][0] == 2  # count
+        assert _records(limiter, "test_client")["test_client"][0] == 2  # count
 
     def test_limit_exceeded_blocked(self):
         limiter = InMemoryRateLimiter()
         # Set up a client that has reached the limit
-        current_time = time.time()
-        limiter.request_records["test_client"] = (5, current_time)
+        current_time = time.monotonic_ns()
+        _records(limiter, "test_client")["test_client"] = (5, current_time)
 
         # Try another request
         is_allowed, retry_after = limiter.check_rate_limit("test_client", 5, 60)
@@ -46,10 +55,10 @@ class TestInMemoryRateLimiter:
     def test_window_expiry_resets_count(self):
         limiter = InMemoryRateLimiter()
         # Set up a client with an expired window
-        current_time = time.time()
-        limiter.request_records["test_client"] = (
+        current_time = time.monotonic_ns()
+        _records(limiter, "test_client")["test_client"] = (
             5,
-            current_time - 61,
+            current_time - 61 * 10**9,
         )  # 61 seconds ago
 
         # New request after window expiry
@@ -57,7 +66,64 @@ class TestInMemoryRateLimiter:
 
         assert is_allowed is True
         assert retry_after == 0
-        assert limiter.request_records["test_client"][0] == 1  # count reset
+        assert _records(limiter, "test_client")["test_client"][0] == 1  # count reset
+
+    def test_lru_eviction_caps_records(self):
+        # One record per shard: a second identifier in the same shard
+        # evicts the least recently seen one
+        limiter = InMemoryRateLimiter(max_entries=InMemoryRateLimiter.NUM_SHARDS)
+
+        limiter.check_rate_limit("client_0", 5, 60)
+        shard = _records(limiter, "client_0")
+        colliding = next(
+            f"client_{i}"
+            for i in range(1, 10_000)
+            if _records(limiter, f"client_{i}") is shard
+        )
+
+        limiter.check_rate_limit(colliding, 5, 60)
+
+        assert "client_0" not in shard
+        assert colliding in shard
+
+    def test_batch_check(self):
+        limiter = InMemoryRateLimiter()
+        limiter.check_rate_limit("client_b", 1, 60)  # exhaust client_b's budget
+
+        results = limiter.check_rate_limit_batch(
+            ["client_a", "client_b", "client_c"], [5, 1, 5], [60, 60, 60]
+        )
+
+        assert results[0] == (True, 0)
+        assert results[1][0] is False
+        assert results[2] == (True, 0)
+        # Batch updates count like individual checks
+        assert _records(limiter, "client_a")["client_a"][0] == 1
+
+    def test_sweep_expired_bulk_drops_stale_records(self):
+        limiter = InMemoryRateLimiter()
+        limiter.check_rate_limit("fresh_client", 5, 60)
+        limiter.check_rate_limit("stale_client", 5, 60)
+
+        # Age one record past the sweep cutoff
+        records = _records(limiter, "stale_client")
+        count, start = records["stale_client"]
+        records["stale_client"] = (count, start - 120 * 10**9)
+
+        dropped = limiter.sweep_expired(max_window_seconds=60)
+
+        assert dropped == 1
+        assert "stale_client" not in _records(limiter, "stale_client")
+        assert "fresh_client" in _records(limiter, "fresh_client")
+
+    def test_identifiers_spread_across_shards(self):
+        limiter = InMemoryRateLimiter()
+        for i in range(256):
+            limiter.check_rate_limit(f"client_{i}", 5, 60)
+
+        populated = sum(1 for _, records in limiter._shards if records)
+        assert populated > 1
+        assert sum(len(records) for _, records in limiter._shards) == 256
 
     def test_data_storage(self):
         limiter = InMemoryRateLimiter()
@@ -65,77 +131,324 @@ class TestInMemoryRateLimiter:
         # Test set_data
         limiter.set_data("test_key", "test_value", ttl=60)
 
-        # Test get_data
+        # Test get_data returns the raw value, not internal bookkeeping
         value = limiter.get_data("test_key")
-        assert value == ("test_value", 60)
+        assert value == "test_value"
 
         # Test for non-existent key
         value = limiter.get_data("non_existent_key")
         assert value is None
 
+    def test_data_storage_ttl_expiry(self):
+        limiter = InMemoryRateLimiter()
+        limiter.set_data("ephemeral", "value", ttl=1)
+        limiter.set_data("permanent", "value")  # no ttl, never expires
+
+        # Age the ephemeral entry past its expiry
+        expired_at = time.time() - 1
+        limiter.data_store["ephemeral"] = ("value", expired_at)
+        limiter._expiry_heap[0] = (expired_at, "ephemeral")
+
+        assert limiter.get_data("ephemeral") is None
+        assert "ephemeral" not in limiter.data_store  # swept, not just hidden
+        assert limiter.get_data("permanent") == "value"
+
+
+class TestCInMemoryRateLimiter:
+    @pytest.fixture
+    def limiter(self):
+        from fast_limiter import CInMemoryRateLimiter
+
+        if CInMemoryRateLimiter is None:
+            pytest.skip("compiled extension not built")
+        return CInMemoryRateLimiter()
+
+    def test_counts_against_limit(self, limiter):
+        assert limiter.check_rate_limit("test_client", 2, 60) == (True, 0)
+        assert limiter.check_rate_limit("test_client", 2, 60) == (True, 0)
+
+        is_allowed, retry_after = limiter.check_rate_limit("test_client", 2, 60)
+        assert is_allowed is False
+        assert 0 < retry_after <= 60
+
+    def test_identifiers_are_independent(self, limiter):
+        limiter.check_rate_limit("client_a", 1, 60)
+        assert limiter.check_rate_limit("client_a", 1, 60)[0] is False
+        assert limiter.check_rate_limit("client_b", 1, 60)[0] is True
+
+    def test_tuple_identifier(self, limiter):
+        # The default identifier func yields (host, path) tuples
+        identifier = ("127.0.0.1", "/test")
+        assert limiter.check_rate_limit(identifier, 1, 60) == (True, 0)
+        assert limiter.check_rate_limit(identifier, 1, 60)[0] is False
+
 
 class TestRedisRateLimiter:
     @pytest.fixture
     def mock_redis(self):
         redis_mock = MagicMock()
-        pipe_mock = MagicMock()
-        redis_mock.pipeline.return_value = pipe_mock
-        pipe_mock.execute.return_value = [None, None]  # Default: no previous records
-        return redis_mock, pipe_mock
+        redis_mock.script_load.return_value = "fakesha"
+        redis_mock.evalsha.return_value = [1, 0]  # Default: request allowed
+        return redis_mock
+
+    def test_script_loaded_once(self, mock_redis):
+        limiter = RedisRateLimiter(mock_redis)
+
+        limiter.check_rate_limit("test_client", 5, 60)
+        limiter.check_rate_limit("test_client", 5, 60)
+
+        mock_redis.script_load.assert_called_once_with(RedisRateLimiter.CHECK_SCRIPT)
+        assert mock_redis.evalsha.call_count == 2
 
     def test_first_request_allowed(self, mock_redis):
-        redis_mock, pipe_mock = mock_redis
-        limiter = RedisRateLimiter(redis_mock)
+        limiter = RedisRateLimiter(mock_redis)
 
         is_allowed, retry_after = limiter.check_rate_limit("test_client", 5, 60)
 
         assert is_allowed is True
         assert retry_after == 0
-        # Verify Redis operations
-        assert pipe_mock.set.call_count == 2
-        assert pipe_mock.execute.call_count == 2
+        # Single round-trip: one EVALSHA, no client-side pipeline
+        mock_redis.evalsha.assert_called_once()
+        args = mock_redis.evalsha.call_args[0]
+        assert args[0] == "fakesha"
+        assert args[1] == 1
+        assert args[2] == "ratelimit:test_client"
 
-    def test_under_limit_allowed(self, mock_redis):
-        redis_mock, pipe_mock = mock_redis
-        limiter = RedisRateLimiter(redis_mock)
+    def test_limit_exceeded_blocked(self, mock_redis):
+        limiter = RedisRateLimiter(mock_redis)
 
-        # Mock existing counter
-        pipe_mock.execute.return_value = [b"3", str(time.time()).encode()]
+        # Script reports the limit was hit
+        mock_redis.evalsha.return_value = [0, 30]
 
         is_allowed, retry_after = limiter.check_rate_limit("test_client", 5, 60)
 
-        assert is_allowed is True
-        assert retry_after == 0
-        assert redis_mock.incr.called
+        assert is_allowed is False
+        assert retry_after == 30
+
+    def test_get_data_returns_value(self, mock_redis):
+        mock_redis.get.return_value = b"stored"
+        limiter = RedisRateLimiter(mock_redis)
+
+        assert limiter.get_data("some_key") == b"stored"
+        mock_redis.get.assert_called_once_with("some_key")
+
+    def test_get_many_uses_mget(self, mock_redis):
+        mock_redis.mget.return_value = [b"a", None]
+        limiter = RedisRateLimiter(mock_redis)
+
+        assert limiter.get_many(["key_a", "key_b"]) == [b"a", None]
+        mock_redis.mget.assert_called_once_with(["key_a", "key_b"])
+
+    def test_batch_check_uses_one_pipeline(self, mock_redis):
+        pipe_mock = mock_redis.pipeline.return_value
+        pipe_mock.execute.return_value = [[1, 0, 1, 0], [0, 30, 5, 0]]
+        limiter = RedisRateLimiter(mock_redis)
+
+        results = limiter.check_rate_limit_batch(
+            ["client_a", "client_b"], [5, 5], [60, 60]
+        )
+
+        assert results == [(True, 0), (False, 30)]
+        mock_redis.pipeline.assert_called_once()
+        assert pipe_mock.evalsha.call_count == 2
+        assert not mock_redis.evalsha.called
+
+    def test_oversized_batch_check_is_chunked(self, mock_redis):
+        pipe_mock = mock_redis.pipeline.return_value
+        pipe_mock.execute.side_effect = [
+            [[1, 0, 1, 0]] * 1000,
+            [[1, 0, 1, 0]] * 200,
+        ]
+        limiter = RedisRateLimiter(mock_redis)
+
+        results = limiter.check_rate_limit_batch(
+            [f"client_{i}" for i in range(1200)], [5] * 1200, [60] * 1200
+        )
+
+        assert len(results) == 1200
+        assert all(result == (True, 0) for result in results)
+        # 1200 rules respect the MAX_PIPELINE=1000 bound: two pipelines
+        assert mock_redis.pipeline.call_count == 2
+
+    def test_batched_checks_answered_locally(self, mock_redis):
+        # Script returns (allowed, retry_after, count, window_start)
+        mock_redis.evalsha.return_value = [1, 0, 1, int(time.time())]
+        limiter = RedisRateLimiter(mock_redis, batch_window=60)
+
+        # First request runs the script and seeds the local snapshot
+        limiter.check_rate_limit("test_client", 10, 60)
+        # Subsequent requests under the limit never touch Redis
+        limiter.check_rate_limit("test_client", 10, 60)
+        limiter.check_rate_limit("test_client", 10, 60)
+
+        assert mock_redis.evalsha.call_count == 1
+
+    def test_flush_pushes_pending_in_one_pipeline(self, mock_redis):
+        mock_redis.evalsha.return_value = [1, 0, 1, int(time.time())]
+        limiter = RedisRateLimiter(mock_redis, batch_window=60)
+
+        limiter.check_rate_limit("test_client", 10, 60)
+        limiter.check_rate_limit("test_client", 10, 60)
+        limiter.check_rate_limit("test_client", 10, 60)
+        limiter.flush()
+
+        pipe_mock = mock_redis.pipeline.return_value
+        pipe_mock.hincrby.assert_called_once_with("ratelimit:test_client", "c", 2)
+        assert pipe_mock.execute.called
+
+        # Nothing left to flush
+        mock_redis.pipeline.reset_mock()
+        limiter.flush()
+        assert not mock_redis.pipeline.called
+
+    def test_failed_flush_keeps_pending_increments(self, mock_redis):
+        mock_redis.evalsha.return_value = [1, 0, 1, int(time.time())]
+        limiter = RedisRateLimiter(mock_redis, batch_window=60)
+        pipe_mock = mock_redis.pipeline.return_value
+
+        limiter.check_rate_limit("test_client", 10, 60)
+        limiter.check_rate_limit("test_client", 10, 60)
+        limiter.check_rate_limit("test_client", 10, 60)
+
+        # Redis goes away mid-flush: nothing is dropped and nothing raises
+        pipe_mock.execute.side_effect = ConnectionError("redis down")
+        limiter.flush()
+        assert limiter._pending["ratelimit:test_client"][0] == 2
+
+        # Next flush retries the same increments
+        pipe_mock.execute.side_effect = None
+        limiter.flush()
+        pipe_mock.hincrby.assert_called_with("ratelimit:test_client", "c", 2)
+        assert not limiter._pending
+
+    def test_large_flush_is_chunked(self, mock_redis):
+        limiter = RedisRateLimiter(mock_redis, batch_window=60)
+
+        # 400 pending keys -> 1200 commands -> two MAX_PIPELINE=1000 batches
+        ops = [
+            (lambda p, i=i: p.hincrby(f"ratelimit:client_{i}", "c", 1)) for i in range(1200)
+        ]
+        limiter._exec_chunked(ops)
+
+        assert mock_redis.pipeline.call_count == 2
+        assert mock_redis.pipeline.return_value.execute.call_count == 2
+
+
+class TestAsyncRedisRateLimiter:
+    @pytest.fixture
+    def mock_redis(self):
+        redis_mock = MagicMock()
+        redis_mock.script_load = AsyncMock(return_value="fakesha")
+        redis_mock.evalsha = AsyncMock(return_value=[1, 0, 1, int(time.time())])
+        pipe_mock = MagicMock()
+        pipe_mock.execute = AsyncMock()
+        redis_mock.pipeline.return_value = pipe_mock
+        return redis_mock
 
-    def test_limit_exceeded_blocked(self, mock_redis):
-        redis_mock, pipe_mock = mock_redis
-        limiter = RedisRateLimiter(redis_mock)
+    @pytest.mark.asyncio
+    async def test_single_check_skips_pipeline(self, mock_redis):
+        limiter = AsyncRedisRateLimiter(mock_redis)
 
-        # Mock reaching the limit
-        current_time = time.time()
-        pipe_mock.execute.return_value = [b"5", str(current_time).encode()]
+        is_allowed, retry_after = await limiter.check_rate_limit("test_client", 5, 60)
 
-        is_allowed, retry_after = limiter.check_rate_limit("test_client", 5, 60)
+        assert is_allowed is True
+        assert retry_after == 0
+        mock_redis.evalsha.assert_awaited_once()
+        assert not mock_redis.pipeline.called
+
+    @pytest.mark.asyncio
+    async def test_concurrent_checks_share_a_pipeline(self, mock_redis):
+        pipe_mock = mock_redis.pipeline.return_value
+        pipe_mock.execute.return_value = [[1, 0, i, 0] for i in range(3)]
+        limiter = AsyncRedisRateLimiter(mock_redis)
+
+        results = await asyncio.gather(
+            limiter.check_rate_limit("client_a", 5, 60),
+            limiter.check_rate_limit("client_b", 5, 60),
+            limiter.check_rate_limit("client_c", 5, 60),
+        )
+
+        assert results == [(True, 0), (True, 0), (True, 0)]
+        # All three checks rode one pipeline; no direct evalsha calls
+        mock_redis.pipeline.assert_called_once()
+        assert pipe_mock.evalsha.call_count == 3
+        assert not mock_redis.evalsha.called
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_strand_the_batch(self, mock_redis):
+        pipe_mock = mock_redis.pipeline.return_value
+        pipe_mock.execute.return_value = [[1, 0, 1, 0], [1, 0, 1, 0]]
+        limiter = AsyncRedisRateLimiter(mock_redis)
+
+        task_a = asyncio.create_task(limiter.check_rate_limit("client_a", 5, 60))
+        task_b = asyncio.create_task(limiter.check_rate_limit("client_b", 5, 60))
+        await asyncio.sleep(0)  # let both enqueue
+        task_a.cancel()  # simulates a client disconnect mid-request
+
+        # The detached flusher still resolves the surviving check
+        assert await asyncio.wait_for(task_b, timeout=1) == (True, 0)
+        with pytest.raises(asyncio.CancelledError):
+            await task_a
+
+        # And the limiter is not wedged for later requests
+        mock_redis.evalsha.return_value = [1, 0, 1, 0]
+        assert await asyncio.wait_for(
+            limiter.check_rate_limit("client_c", 5, 60), timeout=1
+        ) == (True, 0)
+
+    @pytest.mark.asyncio
+    async def test_blocked_result_propagates(self, mock_redis):
+        mock_redis.evalsha.return_value = [0, 30, 5, 0]
+        limiter = AsyncRedisRateLimiter(mock_redis)
+
+        is_allowed, retry_after = await limiter.check_rate_limit("test_client", 5, 60)
 
         assert is_allowed is False
-        assert retry_after > 0
-        assert retry_after <= 60
+        assert retry_after == 30
 
-    def test_window_expiry_resets_count(self, mock_redis):
-        redis_mock, pipe_mock = mock_redis
-        limiter = RedisRateLimiter(redis_mock)
 
-        # Mock an expired window
-        expired_time = time.time() - 61  # 61 seconds ago
-        pipe_mock.execute.return_value = [b"5", str(expired_time).encode()]
+class TestSlidingWindowRedisRateLimiter:
+    @pytest.fixture
+    def mock_redis(self):
+        redis_mock = MagicMock()
+        redis_mock.script_load.return_value = "fakesha"
+        redis_mock.evalsha.return_value = [1, 0]  # Default: request allowed
+        return redis_mock
+
+    def test_request_allowed(self, mock_redis):
+        limiter = SlidingWindowRedisRateLimiter(mock_redis)
 
         is_allowed, retry_after = limiter.check_rate_limit("test_client", 5, 60)
 
         assert is_allowed is True
         assert retry_after == 0
-        assert pipe_mock.set.call_count == 2
-        assert pipe_mock.execute.call_count == 2
+        mock_redis.script_load.assert_called_once_with(
+            SlidingWindowRedisRateLimiter.CHECK_SCRIPT
+        )
+        args = mock_redis.evalsha.call_args[0]
+        assert args[0] == "fakesha"
+        assert args[1] == 1
+        assert args[2] == "ratelimit:sliding:test_client"
+
+    def test_limit_exceeded_blocked(self, mock_redis):
+        limiter = SlidingWindowRedisRateLimiter(mock_redis)
+
+        # Script reports the window is full
+        mock_redis.evalsha.return_value = [0, 42]
+
+        is_allowed, retry_after = limiter.check_rate_limit("test_client", 5, 60)
+
+        assert is_allowed is False
+        assert retry_after == 42
+
+    def test_member_suffix_varies(self, mock_redis):
+        limiter = SlidingWindowRedisRateLimiter(mock_redis)
+
+        limiter.check_rate_limit("test_client", 5, 60)
+        limiter.check_rate_limit("test_client", 5, 60)
+
+        suffixes = [call[0][6] for call in mock_redis.evalsha.call_args_list]
+        assert suffixes[0] != suffixes[1]
 
 
 class TestTokenBucketRateLimiter:
@@ -148,8 +461,11 @@ class TestTokenBucketRateLimiter:
 
         assert is_allowed is True
         assert retry_after == 0
-        # Verify bucket initialization
-        assert storage_mock.set_data.call_count == 2
+        # Bucket state is initialized with a single packed write
+        storage_mock.set_data.assert_called_once()
+        key, value = storage_mock.set_data.call_args[0][:2]
+        assert key == "bucket:test_client"
+        assert value.startswith("4:")  # capacity - 1 tokens
 
     def test_bucket_refill(self):
         storage_mock = MagicMock()
@@ -158,8 +474,7 @@ class TestTokenBucketRateLimiter:
 
         # Mock half-empty bucket with last update 30 seconds ago
         storage_mock.get_data.side_effect = lambda key: {
-            "bucket:test_client": "2.5",
-            "last_update:test_client": str(old_time),
+            "bucket:test_client": f"2.5:{old_time}",
         }.get(key)
 
         limiter = TokenBucketRateLimiter(storage_mock)
@@ -168,7 +483,9 @@ class TestTokenBucketRateLimiter:
         assert is_allowed is True
         assert retry_after == 0
         # Check tokens were refilled and one was consumed
-        assert storage_mock.set_data.call_count == 2
+        storage_mock.set_data.assert_called_once()
+        tokens = float(storage_mock.set_data.call_args[0][1].partition(":")[0])
+        assert tokens > 2.5  # ~2.5 + 30s * (5/60) refill - 1 consumed
 
     def test_empty_bucket_blocked(self):
         storage_mock = MagicMock()
@@ -176,8 +493,7 @@ class TestTokenBucketRateLimiter:
 
         # Mock empty bucket
         storage_mock.get_data.side_effect = lambda key: {
-            "bucket:test_client": "0.5",
-            "last_update:test_client": str(current_time - 1),
+            "bucket:test_client": f"0.5:{current_time - 1}",
         }.get(key)
 
         limiter = TokenBucketRateLimiter(storage_mock)
@@ -185,8 +501,19 @@ class TestTokenBucketRateLimiter:
 
         assert is_allowed is False
         assert retry_after > 0
-        # Only last_update should be updated
-        assert storage_mock.set_data.call_count == 1
+        # Token count is preserved, only last_update moves forward
+        storage_mock.set_data.assert_called_once()
+        assert storage_mock.set_data.call_args[0][1].startswith("0.5:")
+
+    def test_derived_config_cached(self):
+        storage_mock = MagicMock()
+        storage_mock.get_data.return_value = None
+
+        limiter = TokenBucketRateLimiter(storage_mock)
+        limiter.check_rate_limit("client_a", 5, 60)
+        limiter.check_rate_limit("client_b", 5, 60)
+
+        assert limiter._cfg_cache == {(5, 60): (5 / 60, 5)}
 
 
 class TestFixedWindowRateLimiter: